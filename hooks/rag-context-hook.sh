@@ -59,21 +59,29 @@ fi
 # STEP 4: Intent Classification + Routing
 # ============================================
 
+# Intent patterns, checked in priority order by classify_intent
+INTENT_DEBUG_RE='(error|bug|fix|crash|fail|broken|exception|traceback|stack trace|segfault|panic)'
+INTENT_REFACTOR_RE='(refactor|rename|restructure|reorganize|clean up|simplify|extract|split|merge)'
+INTENT_CONCEPTUAL_RE='(how does|why does|why is|architecture|design|pattern|explain|understand|overview|concept)'
+INTENT_FACTUAL_RE='(what is|which|where is|where are|who|list all|show me|find the)'
+INTENT_IMPLEMENT_RE='(implement|add|create|build|write|generate|set up|configure|install)'
+
 # Classify the prompt intent and return intent + depth
 classify_intent() {
     local prompt="$1"
     local lower_prompt
     lower_prompt=$(echo "$prompt" | tr '[:upper:]' '[:lower:]')
 
-    if echo "$lower_prompt" | grep -qE '(error|bug|fix|crash|fail|broken|exception|traceback|stack trace|segfault|panic)'; then
+    # First matching intent wins
+    if [[ $lower_prompt =~ $INTENT_DEBUG_RE ]]; then
         echo "debug 5"
-    elif echo "$lower_prompt" | grep -qE '(refactor|rename|restructure|reorganize|clean up|simplify|extract|split|merge)'; then
+    elif [[ $lower_prompt =~ $INTENT_REFACTOR_RE ]]; then
         echo "refactor 4"
-    elif echo "$lower_prompt" | grep -qE '(how does|why does|why is|architecture|design|pattern|explain|understand|overview|concept)'; then
+    elif [[ $lower_prompt =~ $INTENT_CONCEPTUAL_RE ]]; then
         echo "conceptual 4"
-    elif echo "$lower_prompt" | grep -qE '(what is|which|where is|where are|who|list all|show me|find the)'; then
+    elif [[ $lower_prompt =~ $INTENT_FACTUAL_RE ]]; then
         echo "factual 2"
-    elif echo "$lower_prompt" | grep -qE '(implement|add|create|build|write|generate|set up|configure|install)'; then
+    elif [[ $lower_prompt =~ $INTENT_IMPLEMENT_RE ]]; then
         echo "implement 3"
     else
         echo "general 3"
@@ -356,17 +364,18 @@ deduplicate_results() {
     local memory_files
     memory_files=$(echo "$memory_text" | grep -oE '[a-zA-Z0-9_./-]+\.[a-zA-Z]{1,6}' | sort -u)
 
-    local deduped="$qmd_text"
-    while IFS= read -r file; do
-        [ -z "$file" ] && continue
-        # Remove QMD sections that reference already-known files
-        deduped=$(echo "$deduped" | awk -v f="$file" '
-            /^### / { if (index($0, f) > 0) { skip=1; next } else { skip=0 } }
-            !skip { print }
-        ')
-    done <<< "$memory_files"
-
-    echo "$deduped"
+    # Remove QMD sections that reference already-known files
+    echo "$qmd_text" | awk -v files="$(echo "$memory_files" | tr '\n' ' ')" '
+        BEGIN { n = split(files, known, " ") }
+        /^### / {
+            skip = 0
+            for (i = 1; i <= n; i++) {
+                if (index($0, known[i]) > 0) { skip = 1; break }
+            }
+            if (skip) next
+        }
+        !skip { print }
+    '
 }
 
 QMD_CONTEXT=$(deduplicate_results "$MEMORY_CONTEXT $VECTOR_RESULTS $ENTITY_RESULTS" "$QMD_CONTEXT")
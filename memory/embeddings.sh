@@ -197,14 +197,19 @@ cmd_generate() {
     esac
 }
 
-# Convert JSON array to binary blob for sqlite-vector
+# Convert JSON array to a hex blob literal body for sqlite-vector
 embedding_to_blob() {
     local json_array="$1"
     # Convert JSON array of floats to binary format
     # sqlite-vector expects little-endian float32 values
-    echo "$json_array" | jq -r '.[]' | while read -r val; do
-        python3 -c "import struct; import sys; sys.stdout.buffer.write(struct.pack('<f', $val))"
-    done | base64
+    # Emits hex for use as X'...'; exits 1 if the input is not a numeric array
+    echo "$json_array" | python3 -c '
+import json, struct, sys
+try:
+    v = [float(x) for x in json.load(sys.stdin)]
+except (TypeError, ValueError):
+    sys.exit(1)
+print(struct.pack("<%df" % len(v), *v).hex())'
 }
 
 # Process embedding queue
@@ -249,18 +254,23 @@ cmd_batch() {
 
         # Convert to blob and store
         local blob
-        blob=$(embedding_to_blob "$embedding")
+        if ! blob=$(embedding_to_blob "$embedding") || [ -z "$blob" ]; then
+            sqlite3 "$DB_FILE" "UPDATE embedding_queue SET status = 'error', error_message = 'Invalid embedding response' WHERE id = $queue_id;"
+            echo -e "${RED}✗${NC} Failed: $source_type #$source_id - Invalid embedding response"
+            errors=$((errors + 1))
+            continue
+        fi
 
         # Update the source table with embedding
         case "$source_type" in
             session)
-                sqlite3 "$DB_FILE" "UPDATE sessions SET embedding = X'$(echo "$blob" | base64 -d | xxd -p | tr -d '\n')' WHERE id = $source_id;"
+                sqlite3 "$DB_FILE" "UPDATE sessions SET embedding = X'$blob' WHERE id = $source_id;"
                 ;;
             knowledge)
-                sqlite3 "$DB_FILE" "UPDATE knowledge SET embedding = X'$(echo "$blob" | base64 -d | xxd -p | tr -d '\n')' WHERE id = $source_id;"
+                sqlite3 "$DB_FILE" "UPDATE knowledge SET embedding = X'$blob' WHERE id = $source_id;"
                 ;;
             fact)
-                sqlite3 "$DB_FILE" "UPDATE facts SET embedding = X'$(echo "$blob" | base64 -d | xxd -p | tr -d '\n')' WHERE id = $source_id;"
+                sqlite3 "$DB_FILE" "UPDATE facts SET embedding = X'$blob' WHERE id = $source_id;"
                 ;;
         esac
 
@@ -11,7 +11,7 @@
 #   memory-db.sh add-fact "fact" "category"
 #   memory-db.sh recent [n]               # Get n recent sessions (default 5)
 #   memory-db.sh context "query" [limit]  # Get context for injection
-#   memory-db.sh embed                    # Process embedding queue
+#   memory-db.sh embed [--setup]          # Process embedding queue
 
 set -e
 
@@ -111,11 +111,31 @@ compress_memory() {
     echo "$text"
 }
 
+# Check whether a table exists. Hits are cached for the rest of this
+# invocation (tables are never dropped); misses are re-checked since init
+# commands may create the table later in the same run.
+KNOWN_TABLES=" "
+has_table() {
+    local name="$1"
+    [[ "$KNOWN_TABLES" == *" $name "* ]] && return 0
+
+    local count
+    count=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = '$name';" 2>/dev/null || echo "0")
+    [ "${count:-0}" -gt 0 ] || return 1
+    KNOWN_TABLES+="$name "
+}
+
+# Switch to WAL so hook reads don't block on concurrent writes (persists in the db file)
+enable_wal() {
+    sqlite3 "$DB_FILE" "PRAGMA journal_mode=WAL;" >/dev/null 2>&1 || true
+}
+
 # Initialize database with schema
 cmd_init() {
     ensure_dir
     if [ ! -f "$DB_FILE" ]; then
         sqlite3 "$DB_FILE" < "$SCHEMA_FILE"
+        enable_wal
         echo "Memory database initialized at $DB_FILE"
     else
         echo "Memory database already exists at $DB_FILE"
@@ -154,10 +174,14 @@ CREATE TABLE IF NOT EXISTS entry_relations (
 CREATE INDEX IF NOT EXISTS idx_entity_name ON entity_metadata(entity);
 CREATE INDEX IF NOT EXISTS idx_entity_type ON entity_metadata(entity_type);
 CREATE INDEX IF NOT EXISTS idx_entity_source ON entity_metadata(source_type, source_id);
+CREATE INDEX IF NOT EXISTS idx_entity_name_nocase ON entity_metadata(entity COLLATE NOCASE);
 CREATE INDEX IF NOT EXISTS idx_relation_from ON entry_relations(from_type, from_id);
 CREATE INDEX IF NOT EXISTS idx_relation_to ON entry_relations(to_type, to_id);
 EOF
     fi
+    enable_wal
+    # Gather planner statistics so the entity/relation joins pick index lookups
+    sqlite3 "$DB_FILE" "ANALYZE;" 2>/dev/null || true
     echo "Metadata schema initialized."
 }
 
@@ -169,9 +193,7 @@ extract_entities() {
     local files_json="$4"
 
     # Ensure metadata tables exist
-    local has_meta
-    has_meta=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = 'entity_metadata';" 2>/dev/null || echo "0")
-    [ "$has_meta" -eq 0 ] && return
+    has_table entity_metadata || return 0
 
     local sql=""
 
@@ -233,9 +255,7 @@ cmd_entity_search() {
         exit 1
     fi
 
-    local has_meta
-    has_meta=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = 'entity_metadata';" 2>/dev/null || echo "0")
-    if [ "$has_meta" -eq 0 ]; then
+    if ! has_table entity_metadata; then
         echo "Metadata not initialized. Run 'memory-db.sh init-metadata' first."
         return
     fi
@@ -245,17 +265,31 @@ cmd_entity_search() {
         type_filter="AND em.entity_type = '$(echo "$entity_type" | sed "s/'/''/g")'"
     fi
 
-    sqlite3 "$DB_FILE" <<EOF
-SELECT em.entity, em.entity_type, em.source_type, em.source_id,
-    CASE em.source_type
-        WHEN 'session' THEN (SELECT summary FROM sessions WHERE id = em.source_id)
-        WHEN 'knowledge' THEN (SELECT area || ': ' || summary FROM knowledge WHERE id = em.source_id)
-        WHEN 'fact' THEN (SELECT fact FROM facts WHERE id = em.source_id)
-    END as context
+    # Escape LIKE wildcards so the query is matched literally
+    local like_query
+    like_query=$(echo "$query" | sed "s/'/''/g" | sed 's/[\\%_]/\\&/g')
+
+    # Prefix matches (which can seek idx_entity_name_nocase) rank first; the
+    # remaining slots are filled with the newest non-prefix substring matches.
+    # Context comes from one rowid join per source table.
+    local select_sql="SELECT em.entity, em.entity_type, em.source_type, em.source_id,
+    COALESCE(s.summary, k.area || ': ' || k.summary, f.fact) as context
 FROM entity_metadata em
-WHERE em.entity LIKE '%$(echo "$query" | sed "s/'/''/g")%'
-$type_filter
+LEFT JOIN sessions s ON em.source_type = 'session' AND s.id = em.source_id
+LEFT JOIN knowledge k ON em.source_type = 'knowledge' AND k.id = em.source_id
+LEFT JOIN facts f ON em.source_type = 'fact' AND f.id = em.source_id"
+
+    sqlite3 "$DB_FILE" <<EOF
+SELECT * FROM ($select_sql
+WHERE em.entity LIKE '${like_query}%' ESCAPE '\\' $type_filter
 ORDER BY em.created_at DESC
+LIMIT 10)
+UNION ALL
+SELECT * FROM ($select_sql
+WHERE em.entity LIKE '%${like_query}%' ESCAPE '\\'
+AND em.entity NOT LIKE '${like_query}%' ESCAPE '\\' $type_filter
+ORDER BY em.created_at DESC
+LIMIT 10)
 LIMIT 10;
 EOF
 }
@@ -270,99 +304,95 @@ cmd_consolidate() {
     local merged=0 removed=0
 
     # --- Session consolidation: merge sessions with >50% topic overlap ---
-    local session_ids
-    session_ids=$(sqlite3 "$DB_FILE" "SELECT id FROM sessions ORDER BY created_at DESC;")
-
-    local ids_array=()
-    while IFS= read -r id; do
-        [ -n "$id" ] && ids_array+=("$id")
-    done <<< "$session_ids"
+    # Greedy, newest first: each surviving session absorbs every later one
+    # whose topic overlap is >50% of the smaller topic list.
+    # Emits "keep_id<TAB>drop_id" per merge.
+    local merge_pairs
+    merge_pairs=$(sqlite3 -separator $'\t' "$DB_FILE" "SELECT id, COALESCE(topics, '') FROM sessions ORDER BY created_at DESC;" | awk -F'\t' '
+        {
+            ids[NR] = $1
+            cnt[NR] = 0
+            n = split($2, raw, ",")
+            for (k = 1; k <= n; k++) {
+                t = raw[k]
+                gsub(/^[[:space:]]+|[[:space:]]+$/, "", t)
+                if (t == "") continue
+                cnt[NR]++
+                # Topics are a multiset: duplicates count and pair off one-to-one
+                if (has[NR, t]++ == 0) list[NR, ++uniq[NR]] = t
+            }
+        }
+        END {
+            for (i = 1; i <= NR; i++) {
+                if ((i in dropped) || cnt[i] == 0) continue
+                for (j = i + 1; j <= NR; j++) {
+                    if ((j in dropped) || cnt[j] == 0) continue
+                    overlap = 0
+                    for (k = 1; k <= uniq[j]; k++) {
+                        t = list[j, k]
+                        a = has[i, t]
+                        b = has[j, t]
+                        overlap += a < b ? a : b
+                    }
+                    min_count = cnt[i] < cnt[j] ? cnt[i] : cnt[j]
+                    if (int(overlap * 100 / min_count) > 50) {
+                        dropped[j] = 1
+                        print ids[i] "\t" ids[j]
+                    }
+                }
+            }
+        }')
 
+    # Merge each dropped session's summary into the newer one it overlaps
     local to_delete=()
-    for ((i=0; i<${#ids_array[@]}; i++)); do
-        local id_a="${ids_array[$i]}"
-        # Skip if already marked for deletion
-        [[ " ${to_delete[*]} " == *" $id_a "* ]] && continue
-
-        local topics_a
-        topics_a=$(sqlite3 "$DB_FILE" "SELECT topics FROM sessions WHERE id=$id_a;" | tr ',' '\n' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' | sort)
-        local count_a
-        count_a=$(echo "$topics_a" | grep -c . || echo "0")
-        [ "$count_a" -eq 0 ] && continue
-
-        for ((j=i+1; j<${#ids_array[@]}; j++)); do
-            local id_b="${ids_array[$j]}"
-            [[ " ${to_delete[*]} " == *" $id_b "* ]] && continue
-
-            local topics_b
-            topics_b=$(sqlite3 "$DB_FILE" "SELECT topics FROM sessions WHERE id=$id_b;" | tr ',' '\n' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' | sort)
-            local count_b
-            count_b=$(echo "$topics_b" | grep -c . || echo "0")
-            [ "$count_b" -eq 0 ] && continue
-
-            # Count overlapping topics
-            local overlap
-            overlap=$(comm -12 <(echo "$topics_a") <(echo "$topics_b") | grep -c . || echo "0")
-            local min_count=$(( count_a < count_b ? count_a : count_b ))
-
-            # If >50% overlap, merge into the newer one (id_a) and delete older (id_b)
-            if [ "$min_count" -gt 0 ] && [ $((overlap * 100 / min_count)) -gt 50 ]; then
-                local summary_a summary_b
-                summary_a=$(sqlite3 "$DB_FILE" "SELECT summary FROM sessions WHERE id=$id_a;")
-                summary_b=$(sqlite3 "$DB_FILE" "SELECT summary FROM sessions WHERE id=$id_b;")
-
-                local merged_summary
-                merged_summary=$(compress_memory "$summary_a $summary_b")
-                local escaped_summary
-                escaped_summary=$(echo "$merged_summary" | sed "s/'/''/g")
-
-                sqlite3 "$DB_FILE" "UPDATE sessions SET summary='$escaped_summary' WHERE id=$id_a;"
-                to_delete+=("$id_b")
-                merged=$((merged + 1))
-            fi
-        done
-    done
-
-    # Delete merged sessions
-    for del_id in "${to_delete[@]}"; do
-        sqlite3 "$DB_FILE" "DELETE FROM sessions WHERE id=$del_id;"
+    while IFS=$'\t' read -r id_a id_b; do
+        [ -z "$id_a" ] && continue
+        local summary_a summary_b
+        summary_a=$(sqlite3 "$DB_FILE" "SELECT summary FROM sessions WHERE id=$id_a;")
+        summary_b=$(sqlite3 "$DB_FILE" "SELECT summary FROM sessions WHERE id=$id_b;")
+
+        local merged_summary
+        merged_summary=$(compress_memory "$summary_a $summary_b")
+        local escaped_summary
+        escaped_summary=$(echo "$merged_summary" | sed "s/'/''/g")
+
+        sqlite3 "$DB_FILE" "UPDATE sessions SET summary='$escaped_summary' WHERE id=$id_a;"
+        to_delete+=("$id_b")
+        merged=$((merged + 1))
+    done <<< "$merge_pairs"
+
+    # Delete merged sessions in one set-based statement per table
+    if [ ${#to_delete[@]} -gt 0 ]; then
+        local session_del_list
+        session_del_list=$(IFS=,; echo "${to_delete[*]}")
+        sqlite3 "$DB_FILE" "DELETE FROM sessions WHERE id IN ($session_del_list);"
         # Clean up entity metadata
-        sqlite3 "$DB_FILE" "DELETE FROM entity_metadata WHERE source_type='session' AND source_id=$del_id;" 2>/dev/null || true
-        removed=$((removed + 1))
-    done
+        sqlite3 "$DB_FILE" "DELETE FROM entity_metadata WHERE source_type='session' AND source_id IN ($session_del_list);" 2>/dev/null || true
+        removed=$((removed + ${#to_delete[@]}))
+    fi
 
     # --- Fact consolidation: remove exact duplicates and substring overlaps ---
-    local fact_dupes
-    fact_dupes=$(sqlite3 "$DB_FILE" <<'EOF'
-SELECT f1.id, f2.id FROM facts f1
+    # For each overlapping pair in a category, delete the shorter fact
+    # (keep the longer/more detailed one)
+    local unique_del
+    unique_del=$(sqlite3 "$DB_FILE" <<'EOF'
+SELECT DISTINCT CASE WHEN LENGTH(f1.fact) >= LENGTH(f2.fact) THEN f2.id ELSE f1.id END
+FROM facts f1
 JOIN facts f2 ON f1.id < f2.id AND f1.category = f2.category
 WHERE f1.fact = f2.fact OR INSTR(f1.fact, f2.fact) > 0 OR INSTR(f2.fact, f1.fact) > 0;
 EOF
     )
+    if [ -n "$unique_del" ]; then
+        local fact_del_list fact_del_count
+        fact_del_list=$(echo "$unique_del" | paste -sd, -)
+        fact_del_count=$(echo "$unique_del" | grep -c .)
+        sqlite3 "$DB_FILE" "DELETE FROM facts WHERE id IN ($fact_del_list);"
+        sqlite3 "$DB_FILE" "DELETE FROM entity_metadata WHERE source_type='fact' AND source_id IN ($fact_del_list);" 2>/dev/null || true
+        removed=$((removed + fact_del_count))
+    fi
 
-    local fact_del_ids=()
-    while IFS='|' read -r id1 id2; do
-        [ -z "$id1" ] && continue
-        # Keep the longer/more detailed fact
-        local len1 len2
-        len1=$(sqlite3 "$DB_FILE" "SELECT LENGTH(fact) FROM facts WHERE id=$id1;")
-        len2=$(sqlite3 "$DB_FILE" "SELECT LENGTH(fact) FROM facts WHERE id=$id2;")
-        if [ "$len1" -ge "$len2" ]; then
-            fact_del_ids+=("$id2")
-        else
-            fact_del_ids+=("$id1")
-        fi
-    done <<< "$fact_dupes"
-
-    # Deduplicate the deletion list and delete
-    local unique_del
-    unique_del=$(printf '%s\n' "${fact_del_ids[@]}" | sort -u)
-    while IFS= read -r del_id; do
-        [ -z "$del_id" ] && continue
-        sqlite3 "$DB_FILE" "DELETE FROM facts WHERE id=$del_id;"
-        sqlite3 "$DB_FILE" "DELETE FROM entity_metadata WHERE source_type='fact' AND source_id=$del_id;" 2>/dev/null || true
-        removed=$((removed + 1))
-    done <<< "$unique_del"
+    # Refresh planner statistics incrementally after the bulk deletes
+    sqlite3 "$DB_FILE" "PRAGMA optimize;" 2>/dev/null || true
 
     echo "Consolidation complete: $merged merged, $removed removed."
 }
@@ -513,9 +543,20 @@ cmd_context() {
     local char_limit=$((token_limit * 4))
     local output=""
 
+    # Recent facts and sessions, tagged by kind; id breaks created_at ties
+    # so same-second rows stay newest first
+    local recent_rows
+    recent_rows=$(sqlite3 -separator $'\t' "$DB_FILE" <<'EOF' 2>/dev/null || echo ""
+SELECT * FROM (SELECT 'fact' AS kind, created_at, id, fact FROM facts ORDER BY created_at DESC, id DESC LIMIT 5)
+UNION ALL
+SELECT * FROM (SELECT 'session', created_at, id, summary FROM sessions ORDER BY created_at DESC, id DESC LIMIT 3)
+ORDER BY kind, created_at DESC, id DESC;
+EOF
+)
+
     # Get relevant facts first (highest value, lowest cost)
     local facts
-    facts=$(sqlite3 "$DB_FILE" "SELECT fact FROM facts ORDER BY created_at DESC LIMIT 5;" 2>/dev/null || echo "")
+    facts=$(echo "$recent_rows" | awk -F'\t' '$1 == "fact" { sub(/^[^\t]*\t[^\t]*\t[^\t]*\t/, ""); print }')
     if [ -n "$facts" ]; then
         output+="## Project Facts\n"
         while IFS= read -r fact; do
@@ -541,7 +582,7 @@ EOF
 
     # Get recent session summaries
     local sessions
-    sessions=$(sqlite3 "$DB_FILE" "SELECT summary FROM sessions ORDER BY created_at DESC LIMIT 3;" 2>/dev/null || echo "")
+    sessions=$(echo "$recent_rows" | awk -F'\t' '$1 == "session" { sub(/^[^\t]*\t[^\t]*\t[^\t]*\t/, ""); print }')
     if [ -n "$sessions" ]; then
         output+="## Recent Work\n"
         while IFS= read -r session; do
@@ -578,32 +619,33 @@ cmd_stats() {
         exit 0
     fi
 
+    # Embedding columns only exist once vector search is initialized
+    local vector_sql=""
+    if has_table vector_meta; then
+        vector_sql="SELECT '';
+SELECT 'Vector Search: Enabled';
+SELECT 'Embedded sessions' as type, COUNT(*) as count FROM sessions WHERE embedding IS NOT NULL
+UNION ALL
+SELECT 'Embedded knowledge', COUNT(*) FROM knowledge WHERE embedding IS NOT NULL
+UNION ALL
+SELECT 'Embedded facts', COUNT(*) FROM facts WHERE embedding IS NOT NULL
+UNION ALL
+SELECT 'Pending embeddings', COUNT(*) FROM embedding_queue WHERE status = 'pending';"
+    fi
+
+    # All counts in one process and one read transaction (a single snapshot)
     echo "Memory Database: $DB_FILE"
     echo ""
     sqlite3 "$DB_FILE" <<EOF
+BEGIN;
 SELECT 'Sessions' as type, COUNT(*) as count FROM sessions
 UNION ALL
 SELECT 'Knowledge areas', COUNT(*) FROM knowledge
 UNION ALL
 SELECT 'Facts', COUNT(*) FROM facts;
+$vector_sql
+COMMIT;
 EOF
-
-    # Check for vector support
-    local has_vector
-    has_vector=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = 'vector_meta';" 2>/dev/null || echo "0")
-    if [ "$has_vector" -gt 0 ]; then
-        echo ""
-        echo "Vector Search: Enabled"
-        sqlite3 "$DB_FILE" <<EOF
-SELECT 'Embedded sessions' as type, COUNT(*) as count FROM sessions WHERE embedding IS NOT NULL
-UNION ALL
-SELECT 'Embedded knowledge', COUNT(*) FROM knowledge WHERE embedding IS NOT NULL
-UNION ALL
-SELECT 'Embedded facts', COUNT(*) FROM facts WHERE embedding IS NOT NULL
-UNION ALL
-SELECT 'Pending embeddings', COUNT(*) FROM embedding_queue WHERE status = 'pending';
-EOF
-    fi
 }
 
 # Initialize vector search support
@@ -616,10 +658,7 @@ cmd_init_vector() {
     fi
 
     # Check if vector schema already applied
-    local has_vector
-    has_vector=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = 'vector_meta';" 2>/dev/null || echo "0")
-
-    if [ "$has_vector" -gt 0 ]; then
+    if has_table vector_meta; then
         echo "Vector search already initialized."
         return 0
     fi
@@ -680,10 +719,7 @@ cmd_vsearch() {
     fi
 
     # Check if vector search is available
-    local has_vector
-    has_vector=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE name = 'vector_meta';" 2>/dev/null || echo "0")
-
-    if [ "$has_vector" -eq 0 ]; then
+    if ! has_table vector_meta; then
         echo "Vector search not initialized. Run 'memory-db.sh init-vector' first."
         echo "Falling back to FTS search..."
         cmd_search "$query" "$limit"
@@ -713,19 +749,19 @@ import sys
 import sqlite3
 import json
 import struct
+import heapq
+import itertools
+from pathlib import Path
 
 db_path = sys.argv[1]
 query_embedding = json.loads(sys.argv[2])
 limit = int(sys.argv[3])
 
 def blob_to_floats(blob):
-    """Convert binary blob to list of floats"""
+    """Convert binary blob to a tuple of floats in a single unpack call"""
     if blob is None:
         return None
-    floats = []
-    for i in range(0, len(blob), 4):
-        floats.append(struct.unpack('<f', blob[i:i+4])[0])
-    return floats
+    return struct.unpack(f'<{len(blob) // 4}f', blob)
 
 def cosine_similarity(a, b):
     """Calculate cosine similarity between two vectors"""
@@ -738,46 +774,61 @@ def cosine_similarity(a, b):
         return 0.0
     return dot_product / (norm_a * norm_b)
 
-conn = sqlite3.connect(db_path)
-results = []
-
-# Search sessions
-for row in conn.execute("SELECT id, summary, embedding FROM sessions WHERE embedding IS NOT NULL"):
-    embedding = blob_to_floats(row[2])
-    sim = cosine_similarity(query_embedding, embedding)
-    results.append(('session', row[0], row[1], sim))
+# Read-only connection: skips write-lock and journal setup for this pure read
+conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True, isolation_level=None)
+# One read transaction so scoring and text lookup see the same snapshot
+conn.execute("BEGIN")
+
+def score_rows(source_type, table):
+    """Yield (source_type, id, similarity) straight off the cursor"""
+    for row_id, blob in conn.execute(f"SELECT id, embedding FROM {table} WHERE embedding IS NOT NULL"):
+        yield (source_type, row_id, cosine_similarity(query_embedding, blob_to_floats(blob)))
+
+# Score on (id, embedding) only and keep the top `limit` rows; text is
+# fetched for the printed rows below.
+results = heapq.nlargest(
+    limit,
+    itertools.chain(
+        score_rows('session', 'sessions'),
+        score_rows('knowledge', 'knowledge'),
+        score_rows('fact', 'facts'),
+    ),
+    key=lambda x: x[2],
+)
 
-# Search knowledge
-for row in conn.execute("SELECT id, area, summary, embedding FROM knowledge WHERE embedding IS NOT NULL"):
-    embedding = blob_to_floats(row[3])
-    sim = cosine_similarity(query_embedding, embedding)
-    results.append(('knowledge', row[0], f"{row[1]}: {row[2]}", sim))
+# Result text, truncated to the 100-char display width
+content_sql = {
+    'session': "SELECT SUBSTR(summary, 1, 100) FROM sessions WHERE id = ?",
+    'knowledge': "SELECT SUBSTR(area || ': ' || summary, 1, 100) FROM knowledge WHERE id = ?",
+    'fact': "SELECT SUBSTR(fact, 1, 100) FROM facts WHERE id = ?",
+}
 
-# Search facts
-for row in conn.execute("SELECT id, fact, embedding FROM facts WHERE embedding IS NOT NULL"):
-    embedding = blob_to_floats(row[2])
-    sim = cosine_similarity(query_embedding, embedding)
-    results.append(('fact', row[0], row[1], sim))
+# Print top results
+for source_type, source_id, similarity in results:
+    if similarity > 0.3:  # Minimum similarity threshold
+        content = conn.execute(content_sql[source_type], (source_id,)).fetchone()[0]
+        print(f"[{source_type}:{source_id}] (sim: {similarity:.3f}) {content}")
 
+conn.execute("COMMIT")
 conn.close()
-
-# Sort by similarity and print top results
-results.sort(key=lambda x: x[3], reverse=True)
-for source_type, source_id, content, similarity in results[:limit]:
-    if similarity > 0.3:  # Minimum similarity threshold
-        print(f"[{source_type}:{source_id}] (sim: {similarity:.3f}) {content[:100]}")
 PYTHON
 }
 
 # Process embedding queue
 cmd_embed() {
+    local run_setup="${1:-}"
+
     if [ ! -x "$EMBEDDINGS_SCRIPT" ]; then
         echo "Embeddings script not found at: $EMBEDDINGS_SCRIPT"
         exit 1
     fi
 
-    # Check if setup is complete
+    # Check if setup is complete; only start the interactive wizard on request
     if [ ! -f "$MEMORY_DIR/embedding-config.json" ]; then
+        if [ "$run_setup" != "--setup" ]; then
+            echo "Embeddings not configured. Run '$EMBEDDINGS_SCRIPT setup' or '$0 embed --setup'." >&2
+            exit 1
+        fi
         echo "Embeddings not configured. Running setup..."
         "$EMBEDDINGS_SCRIPT" setup
     fi
@@ -834,7 +885,7 @@ case "${1:-}" in
         cmd_context "$2" "${3:-1500}"
         ;;
     embed)
-        cmd_embed
+        cmd_embed "${2:-}"
         ;;
     stats)
         cmd_stats
@@ -862,7 +913,7 @@ case "${1:-}" in
         echo "  add-fact <fact> [category]"
         echo "  recent [n]              Show n recent sessions"
         echo "  context <query> [limit] Get context for injection"
-        echo "  embed                   Process embedding queue"
+        echo "  embed [--setup]         Process embedding queue (--setup runs the wizard if unconfigured)"
         echo "  consolidate             Merge overlapping sessions and deduplicate facts"
         echo "  entity-search <query> [type]  Search by entity name (type: file|package|concept)"
         echo "  stats                   Show database statistics"
@@ -28,6 +28,8 @@ CREATE TABLE IF NOT EXISTS entry_relations (
 CREATE INDEX IF NOT EXISTS idx_entity_name ON entity_metadata(entity);
 CREATE INDEX IF NOT EXISTS idx_entity_type ON entity_metadata(entity_type);
 CREATE INDEX IF NOT EXISTS idx_entity_source ON entity_metadata(source_type, source_id);
+-- Case-insensitive index for prefix LIKE lookups on entity names
+CREATE INDEX IF NOT EXISTS idx_entity_name_nocase ON entity_metadata(entity COLLATE NOCASE);
 
 -- Indexes for relation lookups
 CREATE INDEX IF NOT EXISTS idx_relation_from ON entry_relations(from_type, from_id);
@@ -243,7 +243,7 @@ process_embeddings() {
         exit 1
     fi
 
-    "$MEMORY_SCRIPT" embed
+    "$MEMORY_SCRIPT" embed --setup
 
     print_success "Embeddings processed"
 }